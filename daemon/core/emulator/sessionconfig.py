@@ -56,6 +56,12 @@ class SessionConfig(ConfigurableManager, ConfigurableOptions):
             default=Sdt.DEFAULT_SDT_URL,
             label="SDT3D URL",
         ),
+        Configuration(
+            _id="ebtables_rate",
+            _type=ConfigDataTypes.FLOAT,
+            default="0.3",
+            label="WLAN ebtables update rate (s)",
+        ),
     ]
     config_type: RegisterTlvs = RegisterTlvs.UTILITY
 
@@ -109,3 +115,16 @@ class SessionConfig(ConfigurableManager, ConfigurableOptions):
         if value is not None:
             value = int(value)
         return value
+
+    def get_config_float(self, name: str, default: Any = None) -> float:
+        """
+        Get configuration value as float.
+
+        :param name: configuration name
+        :param default: default value if not found
+        :return: float for configuration value
+        """
+        value = self.get_config(name, default=default)
+        if value is not None:
+            value = float(value)
+        return value
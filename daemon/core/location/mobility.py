@@ -207,6 +207,9 @@ class WirelessModel(ConfigurableOptions):
     config_type: RegisterTlvs = RegisterTlvs.WIRELESS
     bitmap: str = None
     position_callback: Callable[[CoreInterface], None] = None
+    # True when all_link_data only depends on the linked state of the wlan, so the
+    # wlan can reuse it until links change
+    cache_link_data: bool = False
 
     def __init__(self, session: "Session", _id: int) -> None:
         """
@@ -221,7 +224,8 @@ class WirelessModel(ConfigurableOptions):
     def all_link_data(self, flags: MessageFlags = MessageFlags.NONE) -> List[LinkData]:
         """
         May be used if the model can populate the GUI with wireless (green)
-        link lines.
+        link lines. Results are only cached by the wlan when cache_link_data is
+        set.
 
         :param flags: link data flags
         :return: link data
@@ -257,6 +261,7 @@ class BasicRangeModel(WirelessModel):
     """
 
     name: str = "basic_range"
+    cache_link_data: bool = True
     options: List[Configuration] = [
         Configuration(
             _id="range",
@@ -419,7 +424,7 @@ class BasicRangeModel(WirelessModel):
 
             d = self.calcdistance((x, y, z), (x2, y2, z2))
 
-            # ordering is important, to keep the wlan._linked dict organized
+            # ordering is important, to keep link messages consistent
             a = min(netif, netif2)
             b = max(netif, netif2)
 
@@ -479,6 +484,7 @@ class BasicRangeModel(WirelessModel):
         interface1: CoreInterface,
         interface2: CoreInterface,
         message_type: MessageFlags,
+        color: str = None,
     ) -> LinkData:
         """
         Create a wireless link/unlink data message.
@@ -486,9 +492,11 @@ class BasicRangeModel(WirelessModel):
         :param interface1: interface one
         :param interface2: interface two
         :param message_type: link message type
+        :param color: link color, looked up from the session when not provided
         :return: link data
         """
-        color = self.session.get_link_color(self.wlan.id)
+        if color is None:
+            color = self.session.get_link_color(self.wlan.id)
         return LinkData(
             message_type=message_type,
             node1_id=interface1.node.id,
@@ -521,11 +529,12 @@ class BasicRangeModel(WirelessModel):
         :return: all link data
         """
         all_links = []
+        color = self.session.get_link_color(self.wlan.id)
         with self.wlan._linked_lock:
-            for a in self.wlan._linked:
-                for b in self.wlan._linked[a]:
-                    if self.wlan._linked[a][b]:
-                        all_links.append(self.create_link_data(a, b, flags))
+            for key, linked in self.wlan._linked.items():
+                if linked:
+                    a, b = sorted(key)
+                    all_links.append(self.create_link_data(a, b, flags, color))
         return all_links
 
 
@@ -7,7 +7,7 @@ import os
 import shutil
 import threading
 from threading import RLock
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple, Type
 
 import netaddr
 
@@ -989,7 +989,8 @@ class CoreNetworkBase(NodeBase):
         """
         super().__init__(session, _id, name, start, server)
         self.brname = None
-        self._linked = {}
+        # linked state for interface pairs, keyed by the pair of interfaces
+        self._linked: Dict[FrozenSet[CoreInterface], bool] = {}
         self._linked_lock = threading.Lock()
 
     def startup(self) -> None:
@@ -1039,8 +1040,6 @@ class CoreNetworkBase(NodeBase):
         i = self.newifindex()
         self._netif[i] = netif
         netif.netifi = i
-        with self._linked_lock:
-            self._linked[netif] = {}
 
     def detach(self, netif: CoreInterface) -> None:
         """
@@ -1052,7 +1051,8 @@ class CoreNetworkBase(NodeBase):
         del self._netif[netif.netifi]
         netif.netifi = None
         with self._linked_lock:
-            del self._linked[netif]
+            for key in [x for x in self._linked if netif in x]:
+                del self._linked[key]
 
     def all_link_data(self, flags: MessageFlags = MessageFlags.NONE) -> List[LinkData]:
         """
@@ -1063,6 +1063,9 @@ class CoreNetworkBase(NodeBase):
         :return: list of link data
         """
         all_links = []
+        node_id = self.id
+        linktype = self.linktype
+        no_flags = MessageFlags.NONE
 
         # build a link message from this network node to each node having a
         # connected interface
@@ -1076,7 +1079,7 @@ class CoreNetworkBase(NodeBase):
                 if not netif.othernet:
                     continue
                 linked_node = netif.othernet
-                if linked_node.id == self.id:
+                if linked_node.id == node_id:
                     continue
                 netif.swapparams("_params_up")
                 upstream_params = netif.getparams()
@@ -1088,25 +1091,19 @@ class CoreNetworkBase(NodeBase):
             if uni:
                 unidirectional = 1
 
-            interface2_ip4 = None
-            interface2_ip4_mask = None
-            interface2_ip6 = None
-            interface2_ip6_mask = None
-            for address in netif.addrlist:
-                ip, _sep, mask = address.partition("/")
-                mask = int(mask)
-                if netaddr.valid_ipv4(ip):
-                    interface2_ip4 = ip
-                    interface2_ip4_mask = mask
-                else:
-                    interface2_ip6 = ip
-                    interface2_ip6_mask = mask
+            (
+                interface2_ip4,
+                interface2_ip4_mask,
+                interface2_ip6,
+                interface2_ip6_mask,
+            ) = netif.parsed_addrlist()
+            delay, bandwidth, loss, duplicate, jitter = netif.get_link_params()
 
             link_data = LinkData(
                 message_type=flags,
-                node1_id=self.id,
+                node1_id=node_id,
                 node2_id=linked_node.id,
-                link_type=self.linktype,
+                link_type=linktype,
                 unidirectional=unidirectional,
                 interface2_id=linked_node.getifindex(netif),
                 interface2_name=netif.name,
@@ -1115,11 +1112,11 @@ class CoreNetworkBase(NodeBase):
                 interface2_ip4_mask=interface2_ip4_mask,
                 interface2_ip6=interface2_ip6,
                 interface2_ip6_mask=interface2_ip6_mask,
-                delay=netif.getparam("delay"),
-                bandwidth=netif.getparam("bw"),
-                dup=netif.getparam("duplicate"),
-                jitter=netif.getparam("jitter"),
-                per=netif.getparam("loss"),
+                delay=delay,
+                bandwidth=bandwidth,
+                dup=duplicate,
+                jitter=jitter,
+                per=loss,
             )
 
             all_links.append(link_data)
@@ -1127,20 +1124,21 @@ class CoreNetworkBase(NodeBase):
             if not uni:
                 continue
 
+            netif.swapparams("_params_up")
+            delay, bandwidth, loss, duplicate, jitter = netif.get_link_params()
             netif.swapparams("_params_up")
             link_data = LinkData(
-                message_type=MessageFlags.NONE,
+                message_type=no_flags,
                 node1_id=linked_node.id,
-                node2_id=self.id,
-                link_type=self.linktype,
+                node2_id=node_id,
+                link_type=linktype,
                 unidirectional=1,
-                delay=netif.getparam("delay"),
-                bandwidth=netif.getparam("bw"),
-                dup=netif.getparam("duplicate"),
-                jitter=netif.getparam("jitter"),
-                per=netif.getparam("loss"),
+                delay=delay,
+                bandwidth=bandwidth,
+                dup=duplicate,
+                jitter=jitter,
+                per=loss,
             )
-            netif.swapparams("_params_up")
 
             all_links.append(link_data)
 
@@ -3,6 +3,7 @@ virtual ethernet classes that implement the interfaces available under Linux.
 """
 
 import logging
+import sys
 import time
 from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
@@ -11,6 +12,8 @@ from core.emulator.enumerations import MessageFlags, TransportType
 from core.errors import CoreCommandError
 from core.nodes.netclient import LinuxNetClient, get_net_client
 
+_LINK_PARAM_KEYS = ("delay", "bw", "loss", "duplicate", "jitter")
+
 if TYPE_CHECKING:
     from core.emulator.distributed import DistributedServer
     from core.emulator.session import Session
@@ -22,6 +25,30 @@ class CoreInterface:
     Base class for network interfaces.
     """
 
+    __slots__ = (
+        "session",
+        "node",
+        "name",
+        "localname",
+        "up",
+        "mtu",
+        "net",
+        "othernet",
+        "_params",
+        "_params_up",
+        "addrlist",
+        "_parsed_addrs",
+        "hwaddr",
+        "poshook",
+        "transport_type",
+        "netindex",
+        "netifi",
+        "flow_id",
+        "server",
+        "net_client",
+        "control",
+    )
+
     def __init__(
         self,
         session: "Session",
@@ -52,6 +79,10 @@ class CoreInterface:
         self.othernet: Optional[CoreNetworkBase] = None
         self._params: Dict[str, float] = {}
         self.addrlist: List[str] = []
+        # cached (ip4, ip4 mask, ip6, ip6 mask) parsed from addrlist
+        self._parsed_addrs: Optional[
+            Tuple[Optional[str], Optional[int], Optional[str], Optional[int]]
+        ] = None
         self.hwaddr: Optional[str] = None
         # placeholder position hook
         self.poshook: Callable[[CoreInterface], None] = lambda x: None
@@ -139,6 +170,7 @@ class CoreInterface:
         """
         addr = utils.validate_ip(addr)
         self.addrlist.append(addr)
+        self._parsed_addrs = None
 
     def deladdr(self, addr: str) -> None:
         """
@@ -148,6 +180,34 @@ class CoreInterface:
         :return: nothing
         """
         self.addrlist.remove(addr)
+        self._parsed_addrs = None
+
+    def parsed_addrlist(
+        self,
+    ) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[int]]:
+        """
+        Retrieve the ip4 and ip6 addresses and masks for this interface, parsed
+        from the address list once and cached until the address list changes.
+
+        :return: ip4 address, ip4 mask, ip6 address, ip6 mask
+        """
+        if self._parsed_addrs is None:
+            ip4 = None
+            ip4_mask = None
+            ip6 = None
+            ip6_mask = None
+            for address in self.addrlist:
+                ip, mask = address.split("/", 1)
+                ip = sys.intern(ip)
+                mask = int(mask)
+                if ":" not in ip:
+                    ip4 = ip
+                    ip4_mask = mask
+                else:
+                    ip6 = ip
+                    ip6_mask = mask
+            self._parsed_addrs = (ip4, ip4_mask, ip6, ip6_mask)
+        return self._parsed_addrs
 
     def sethwaddr(self, addr: str) -> None:
         """
@@ -169,6 +229,15 @@ class CoreInterface:
         """
         return self._params.get(key)
 
+    def get_link_params(self) -> Tuple[Optional[float], ...]:
+        """
+        Retrieve the link parameters used for link data in one call.
+
+        :return: delay, bandwidth, loss, duplicate, and jitter values, None for
+            parameters that do not exist
+        """
+        return tuple(map(self._params.get, _LINK_PARAM_KEYS))
+
     def getparams(self) -> List[Tuple[str, float]]:
         """
         Return (key, value) pairs for parameters.
@@ -237,6 +306,8 @@ class Veth(CoreInterface):
     Provides virtual ethernet functionality for core nodes.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         session: "Session",
@@ -305,6 +376,8 @@ class TunTap(CoreInterface):
     TUN/TAP virtual device in TAP mode
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         session: "Session",
@@ -477,6 +550,8 @@ class GreTap(CoreInterface):
     having a MAC address. The MAC address is required for bridging.
     """
 
+    __slots__ = ("id",)
+
     def __init__(
         self,
         node: "CoreNode" = None,
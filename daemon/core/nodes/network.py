@@ -5,7 +5,20 @@ Defines network nodes used within core.
 import logging
 import threading
 import time
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Type
+import weakref
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 import netaddr
 
@@ -53,25 +66,40 @@ class EbtablesQueue:
         until a WLAN is instantiated.
         """
         self.doupdateloop: bool = False
+        # invariant prefix for ebtables atomic file commands
+        self.atomic_prefix: str = f"{EBTABLES_BIN} --atomic-file {self.atomic_file} "
         self.updatethread: Optional[threading.Thread] = None
-        # this lock protects cmds and updates lists
-        self.updatelock: threading.Lock = threading.Lock()
-        # list of pending ebtables commands
+        # signaled to wake the update loop when changes are queued
+        self.wakeup: threading.Event = threading.Event()
+        # WLAN changes queued by any thread, only drained by the update thread,
+        # queued tracks what is in the queue so each WLAN is queued at most once;
+        # WLANs are tracked by weak reference, so WLANs that have gone away are
+        # skipped
+        self.update_queue: Deque[weakref.ref] = deque()
+        self.queued: Set[weakref.ref] = set()
+        # list of pending ebtables commands, only used by the update thread
         self.cmds: List[str] = []
-        # list of WLANs requiring update
-        self.updates: List["CoreNetwork"] = []
+        # set of WLANs requiring update, only used by the update thread
+        self.updates: Set[weakref.ref] = set()
         # timestamps of last WLAN update; this keeps track of WLANs that are
-        # using this queue
-        self.last_update_time: Dict["CoreNetwork", float] = {}
+        # using this queue, WLANs that have gone away drop out on their own
+        self.last_update_time: Dict[weakref.ref, float] = {}
+        # update rate requested by the session of each WLAN using this queue, the
+        # queue runs at the fastest requested rate
+        self.rates: Dict[weakref.ref, float] = {}
 
     def startupdateloop(self, wlan: "CoreNetwork") -> None:
         """
         Kick off the update loop; only needs to be invoked once.
 
+        :param wlan: wlan entity
         :return: nothing
         """
-        with self.updatelock:
-            self.last_update_time[wlan] = time.monotonic()
+        ref = self.wlanref(wlan)
+        options = wlan.session.options
+        self.rates[ref] = options.get_config_float("ebtables_rate", EbtablesQueue.rate)
+        self.setrate()
+        self.last_update_time[ref] = time.monotonic()
         if self.doupdateloop:
             return
         self.doupdateloop = True
@@ -84,20 +112,49 @@ class EbtablesQueue:
 
         :return: nothing
         """
-        with self.updatelock:
-            try:
-                del self.last_update_time[wlan]
-            except KeyError:
-                logging.exception(
-                    "error deleting last update time for wlan, ignored before: %s", wlan
-                )
+        ref = weakref.ref(wlan)
+        if self.last_update_time.pop(ref, None) is None:
+            logging.debug("no last update time to delete for wlan: %s", wlan)
+        if self.rates.pop(ref, None) is not None:
+            self.setrate()
         if len(self.last_update_time) > 0:
             return
         self.doupdateloop = False
+        self.wakeup.set()
         if self.updatethread:
             self.updatethread.join()
             self.updatethread = None
 
+    def wlanref(self, wlan: "CoreNetwork") -> weakref.ref:
+        """
+        Create a weak reference to a WLAN for tracking update times, that removes
+        itself from the update times when the WLAN goes away.
+
+        :param wlan: wlan entity
+        :return: weak reference to wlan
+        """
+        return weakref.ref(wlan, self.wlandead)
+
+    def wlandead(self, ref: weakref.ref) -> None:
+        """
+        Weak reference callback for a WLAN that has gone away.
+
+        :param ref: dead weak reference to remove
+        :return: nothing
+        """
+        self.last_update_time.pop(ref, None)
+        if self.rates.pop(ref, None) is not None:
+            self.setrate()
+
+    def setrate(self) -> None:
+        """
+        Set the update rate to the fastest rate requested by the WLANs using this
+        queue, or the default rate when there are none.
+
+        :return: nothing
+        """
+        self.rate = min(list(self.rates.values()), default=EbtablesQueue.rate)
+
     def ebatomiccmd(self, cmd: str) -> str:
         """
         Helper for building ebtables atomic file command list.
@@ -105,7 +162,7 @@ class EbtablesQueue:
         :param cmd: ebtable command
         :return: ebtable atomic command
         """
-        return f"{EBTABLES_BIN} --atomic-file {self.atomic_file} {cmd}"
+        return self.atomic_prefix + cmd
 
     def lastupdate(self, wlan: "CoreNetwork") -> float:
         """
@@ -114,13 +171,11 @@ class EbtablesQueue:
         :param wlan: wlan entity
         :return: elpased time
         """
-        try:
-            elapsed = time.monotonic() - self.last_update_time[wlan]
-        except KeyError:
-            self.last_update_time[wlan] = time.monotonic()
-            elapsed = 0.0
-
-        return elapsed
+        last_update = self.last_update_time.get(weakref.ref(wlan))
+        if last_update is None:
+            self.last_update_time[self.wlanref(wlan)] = time.monotonic()
+            return 0.0
+        return time.monotonic() - last_update
 
     def updated(self, wlan: "CoreNetwork") -> None:
         """
@@ -129,8 +184,7 @@ class EbtablesQueue:
         :param wlan: wlan entity
         :return: nothing
         """
-        self.last_update_time[wlan] = time.monotonic()
-        self.updates.remove(wlan)
+        self.last_update_time[self.wlanref(wlan)] = time.monotonic()
 
     def updateloop(self) -> None:
         """
@@ -141,50 +195,70 @@ class EbtablesQueue:
         :return: nothing
         """
         while self.doupdateloop:
-            with self.updatelock:
-                for wlan in self.updates:
-                    # Check if wlan is from a previously closed session. Because of the
-                    # rate limiting scheme employed here, this may happen if a new session
-                    # is started soon after closing a previous session.
-                    # TODO: if these are WlanNodes, this will never throw an exception
-                    try:
-                        wlan.session
-                    except Exception:
-                        # Just mark as updated to remove from self.updates.
-                        self.updated(wlan)
-                        continue
-
-                    if self.lastupdate(wlan) > self.rate:
-                        self.buildcmds(wlan)
-                        self.ebcommit(wlan)
-                        self.updated(wlan)
-
-            time.sleep(self.rate)
+            # coalesce queued changes into the pending updates
+            while self.update_queue:
+                ref = self.update_queue.popleft()
+                self.queued.discard(ref)
+                # hold the wlan while its reference is added to pending updates
+                wlan = ref()
+                if wlan is not None:
+                    self.updates.add(ref)
+
+            # swap out pending updates, rate limited WLANs are added back
+            pending, self.updates = self.updates, set()
+            for ref in pending:
+                wlan = ref()
+                if wlan is None:
+                    continue
+
+                # Check if wlan is from a previously closed session. Because of the
+                # rate limiting scheme employed here, this may happen if a new session
+                # is started soon after closing a previous session.
+                # Shutdown deletes the session attribute, just drop it from pending
+                # updates.
+                if getattr(wlan, "session", None) is None:
+                    continue
+
+                if self.lastupdate(wlan) > self.rate:
+                    self.ebupdate(wlan)
+                else:
+                    self.updates.add(ref)
+            # only wake up on a timer while rate limited updates are pending,
+            # otherwise sleep until a change is queued or the loop is stopped
+            timeout = self.rate if self.updates else None
+
+            self.wakeup.wait(timeout)
+            self.wakeup.clear()
+
+    def ebupdate(self, wlan: "CoreNetwork") -> None:
+        """
+        Update the ebtables chain for a WLAN, changes that cancel out since the
+        last update produce no commands and skip the commit.
+
+        :param wlan: wlan entity
+        :return: nothing
+        """
+        self.buildcmds(wlan)
+        if self.cmds:
+            self.ebcommit(wlan)
+        self.updated(wlan)
 
     def ebcommit(self, wlan: "CoreNetwork") -> None:
         """
         Perform ebtables atomic commit using commands built in the self.cmds list.
+        All commands are chained into a single shell invocation.
 
         :return: nothing
         """
-        # save kernel ebtables snapshot to a file
-        args = self.ebatomiccmd("--atomic-save")
-        wlan.host_cmd(args)
-
-        # modify the table file using queued ebtables commands
-        for c in self.cmds:
-            args = self.ebatomiccmd(c)
-            wlan.host_cmd(args)
+        # save kernel ebtables snapshot to a file, modify the table file using
+        # queued ebtables commands, then commit the table file to the kernel
+        args = [self.ebatomiccmd("--atomic-save")]
+        args.extend(self.ebatomiccmd(c) for c in self.cmds)
+        args.append(self.ebatomiccmd("--atomic-commit"))
+        args.append(f"rm -f {self.atomic_file}")
         self.cmds = []
-
-        # commit the table file to the kernel
-        args = self.ebatomiccmd("--atomic-commit")
-        wlan.host_cmd(args)
-
-        try:
-            wlan.host_cmd(f"rm -f {self.atomic_file}")
-        except CoreCommandError:
-            logging.exception("error removing atomic file: %s", self.atomic_file)
+        with ebtables_lock:
+            wlan.host_cmd(" && ".join(args), shell=True)
 
     def ebchange(self, wlan: "CoreNetwork") -> None:
         """
@@ -193,63 +267,86 @@ class EbtablesQueue:
 
         :return: nothing
         """
-        with self.updatelock:
-            if wlan not in self.updates:
-                self.updates.append(wlan)
+        # the reference is hashed here while the wlan is alive, adding it to the
+        # queue again is skipped until the update thread has taken it
+        ref = weakref.ref(wlan)
+        if ref not in self.queued:
+            self.queued.add(ref)
+            self.update_queue.append(ref)
+        self.wakeup.set()
 
     def buildcmds(self, wlan: "CoreNetwork") -> None:
         """
-        Inspect a _linked dict from a wlan, and rebuild the ebtables chain for that WLAN.
+        Inspect a _linked dict from a wlan, and update the ebtables chain for that
+        WLAN. The chain is built in full when created, afterwards only rules for
+        interface pairs changed since the last update are added or deleted.
 
         :return: nothing
         """
         with wlan._linked_lock:
             if wlan.has_ebtables_chain:
-                # flush the chain
-                self.cmds.append(f"-F {wlan.brname}")
+                keys = list(wlan._dirty_pairs)
             else:
                 wlan.has_ebtables_chain = True
+                wlan._chain_rules.clear()
                 self.cmds.extend(
                     [
                         f"-N {wlan.brname} -P {wlan.policy.value}",
                         f"-A FORWARD --logical-in {wlan.brname} -j {wlan.brname}",
                     ]
                 )
-            # rebuild the chain
-            for netif1, v in wlan._linked.items():
-                for netif2, linked in v.items():
-                    if wlan.policy == NetworkPolicy.DROP and linked:
-                        self.cmds.extend(
-                            [
-                                f"-A {wlan.brname} -i {netif1.localname} -o {netif2.localname} -j ACCEPT",
-                                f"-A {wlan.brname} -o {netif1.localname} -i {netif2.localname} -j ACCEPT",
-                            ]
-                        )
-                    elif wlan.policy == NetworkPolicy.ACCEPT and not linked:
-                        self.cmds.extend(
-                            [
-                                f"-A {wlan.brname} -i {netif1.localname} -o {netif2.localname} -j DROP",
-                                f"-A {wlan.brname} -o {netif1.localname} -i {netif2.localname} -j DROP",
-                            ]
-                        )
+                keys = list(wlan._linked)
+            wlan._dirty_pairs.clear()
+            # linked pairs are accepted on drop and unlinked dropped on accept,
+            # pairs no longer attached have their rules removed
+            needs_rule = wlan.policy == NetworkPolicy.DROP
+            cmds = []
+            for key in keys:
+                rules = wlan._chain_rules.get(key)
+                if wlan._linked.get(key) == needs_rule:
+                    if rules is None:
+                        rules = wlan.ebrules(*key)
+                        wlan._chain_rules[key] = rules
+                        cmds.extend(f"-A {rule}" for rule in rules)
+                elif rules is not None:
+                    del wlan._chain_rules[key]
+                    cmds.extend(f"-D {rule}" for rule in rules)
+        self.cmds.extend(cmds)
 
 
 # a global object because all WLANs share the same queue
-# cannot have multiple threads invoking the ebtables commnd
+# cannot have multiple threads invoking the ebtables commnd, ebtables_lock
+# serializes atomic commits from the queue and ebtablescmds, so direct commands
+# are not lost when a commit writes back an older table snapshot
 ebq: EbtablesQueue = EbtablesQueue()
 
 
 def ebtablescmds(call: Callable[..., str], cmds: List[str]) -> None:
     """
-    Run ebtable commands.
+    Run ebtable commands, chained into a single shell invocation.
 
     :param call: function to call commands
-    :param cmds: commands to call
+    :param cmds: ebtables commands to call, without the ebtables binary
     :return: nothing
     """
+    args = " && ".join(f"{EBTABLES_BIN} {cmd}" for cmd in cmds)
     with ebtables_lock:
-        for args in cmds:
-            call(args)
+        call(args, shell=True)
+
+
+def tccmds(call: Callable[..., str], cmds: List[str]) -> None:
+    """
+    Run tc commands, multiple commands are run within a single tc batch.
+
+    :param call: function to call commands
+    :param cmds: tc commands to call, without the tc binary
+    :return: nothing
+    """
+    if len(cmds) == 1:
+        call(f"{TC_BIN} {cmds[0]}")
+    elif cmds:
+        batch = "\n".join(cmds)
+        call(f"{TC_BIN} -batch - << 'EOF'\n{batch}\nEOF", shell=True)
 
 
 class CoreNetwork(CoreNetworkBase):
@@ -285,9 +382,21 @@ class CoreNetwork(CoreNetworkBase):
         if policy is not None:
             self.policy = policy
         self.name: Optional[str] = name
-        sessionid = self.session.short_session_id()
-        self.brname: str = f"b.{self.id}.{sessionid}"
+        # cache values used for building device names
+        self._sessionid: str = self.session.short_session_id()
+        try:
+            self._id_hex: str = f"{self.id:x}"
+        except TypeError:
+            self._id_hex = str(self.id)
+        self.brname: str = f"b.{self.id}.{self._sessionid}"
         self.has_ebtables_chain: bool = False
+        # ebtables rule state for interface pairs, protected by _linked_lock
+        # cached rules for linked interface pairs
+        self._rule_cache: Dict[FrozenSet[CoreInterface], Tuple[str, str]] = {}
+        # rules currently in the ebtables chain
+        self._chain_rules: Dict[FrozenSet[CoreInterface], Tuple[str, str]] = {}
+        # pairs changed since the chain was last updated
+        self._dirty_pairs: Set[FrozenSet[CoreInterface]] = set()
         if start:
             self.startup()
             ebq.startupdateloop(self)
@@ -343,8 +452,8 @@ class CoreNetwork(CoreNetworkBase):
             self.net_client.delete_bridge(self.brname)
             if self.has_ebtables_chain:
                 cmds = [
-                    f"{EBTABLES_BIN} -D FORWARD --logical-in {self.brname} -j {self.brname}",
-                    f"{EBTABLES_BIN} -X {self.brname}",
+                    f"-D FORWARD --logical-in {self.brname} -j {self.brname}",
+                    f"-X {self.brname}",
                 ]
                 ebtablescmds(self.host_cmd, cmds)
         except CoreCommandError:
@@ -356,6 +465,9 @@ class CoreNetwork(CoreNetworkBase):
 
         self._netif.clear()
         self._linked.clear()
+        self._rule_cache.clear()
+        self._chain_rules.clear()
+        self._dirty_pairs.clear()
         del self.session
         self.up = False
 
@@ -380,6 +492,11 @@ class CoreNetwork(CoreNetworkBase):
         if self.up:
             netif.net_client.delete_interface(self.brname, netif.localname)
         super().detach(netif)
+        with self._linked_lock:
+            for key in [x for x in self._rule_cache if netif in x]:
+                del self._rule_cache[key]
+            # stale rules are removed on the next chain update
+            self._dirty_pairs.update(x for x in self._chain_rules if netif in x)
 
     def linked(self, netif1: CoreInterface, netif2: CoreInterface) -> bool:
         """
@@ -396,19 +513,41 @@ class CoreNetwork(CoreNetworkBase):
         if self._netif[netif2.netifi] != netif2:
             raise ValueError(f"inconsistency for netif {netif2.name}")
 
-        try:
-            linked = self._linked[netif1][netif2]
-        except KeyError:
+        linked = self._linked.get(frozenset((netif1, netif2)))
+        if linked is None:
             if self.policy == NetworkPolicy.ACCEPT:
                 linked = True
             elif self.policy == NetworkPolicy.DROP:
                 linked = False
             else:
                 raise Exception(f"unknown policy: {self.policy.value}")
-            self._linked[netif1][netif2] = linked
 
         return linked
 
+    def ebrules(self, netif1: CoreInterface, netif2: CoreInterface) -> Tuple[str, str]:
+        """
+        Retrieve the ebtables rules, one for each direction without the append or
+        delete command, used between two interfaces when their linked state differs
+        from the network policy. Rules are built once and cached, callers are
+        expected to hold _linked_lock.
+
+        :param netif1: interface one
+        :param netif2: interface two
+        :return: ebtables rules for both directions
+        """
+        key = frozenset((netif1, netif2))
+        rules = self._rule_cache.get(key)
+        if rules is None:
+            action = "ACCEPT" if self.policy == NetworkPolicy.DROP else "DROP"
+            name1 = netif1.localname
+            name2 = netif2.localname
+            rules = (
+                f"{self.brname} -i {name1} -o {name2} -j {action}",
+                f"{self.brname} -o {name1} -i {name2} -j {action}",
+            )
+            self._rule_cache[key] = rules
+        return rules
+
     def unlink(self, netif1: CoreInterface, netif2: CoreInterface) -> None:
         """
         Unlink two interfaces, resulting in adding or removing ebtables
@@ -421,7 +560,10 @@ class CoreNetwork(CoreNetworkBase):
         with self._linked_lock:
             if not self.linked(netif1, netif2):
                 return
-            self._linked[netif1][netif2] = False
+            key = frozenset((netif1, netif2))
+            self._linked[key] = False
+            self._dirty_pairs.add(key)
+            self.ebrules(netif1, netif2)
 
         ebq.ebchange(self)
 
@@ -437,7 +579,10 @@ class CoreNetwork(CoreNetworkBase):
         with self._linked_lock:
             if self.linked(netif1, netif2):
                 return
-            self._linked[netif1][netif2] = True
+            key = frozenset((netif1, netif2))
+            self._linked[key] = True
+            self._dirty_pairs.add(key)
+            self.ebrules(netif1, netif2)
 
         ebq.ebchange(self)
 
@@ -453,9 +598,13 @@ class CoreNetwork(CoreNetworkBase):
         :return: nothing
         """
         devname = netif.localname
-        tc = f"{TC_BIN} qdisc replace dev {devname}"
         parent = "root"
         changed = False
+        # tc commands are collected and run together, qdisc state is only
+        # recorded on the interface once they have run
+        cmds = []
+        has_tbf = netif.getparam("has_tbf")
+        has_netem = netif.getparam("has_netem")
         bw = options.bandwidth
         if netif.setparam("bw", bw):
             # from tc-tbf(8): minimum value for burst is rate / kernel_hz
@@ -465,48 +614,46 @@ class CoreNetwork(CoreNetworkBase):
             tbf = f"tbf rate {bw} burst {burst} limit {limit}"
             if bw > 0:
                 if self.up:
-                    cmd = f"{tc} {parent} handle 1: {tbf}"
-                    netif.host_cmd(cmd)
-                netif.setparam("has_tbf", True)
+                    cmds.append(f"qdisc replace dev {devname} {parent} handle 1: {tbf}")
+                has_tbf = True
                 changed = True
-            elif netif.getparam("has_tbf") and bw <= 0:
+            elif has_tbf and bw <= 0:
                 if self.up:
-                    cmd = f"{TC_BIN} qdisc delete dev {devname} {parent}"
-                    netif.host_cmd(cmd)
-                netif.setparam("has_tbf", False)
+                    cmds.append(f"qdisc delete dev {devname} {parent}")
+                has_tbf = False
                 # removing the parent removes the child
-                netif.setparam("has_netem", False)
+                has_netem = False
                 changed = True
-        if netif.getparam("has_tbf"):
+        if has_tbf:
             parent = "parent 1:1"
-        netem = "netem"
         delay = options.delay
-        changed = max(changed, netif.setparam("delay", delay))
+        changed = netif.setparam("delay", delay) or changed
         loss = options.per
         if loss is not None:
             loss = float(loss)
-        changed = max(changed, netif.setparam("loss", loss))
+        changed = netif.setparam("loss", loss) or changed
         duplicate = options.dup
         if duplicate is not None:
             duplicate = int(duplicate)
-        changed = max(changed, netif.setparam("duplicate", duplicate))
+        changed = netif.setparam("duplicate", duplicate) or changed
         jitter = options.jitter
-        changed = max(changed, netif.setparam("jitter", jitter))
+        changed = netif.setparam("jitter", jitter) or changed
         if not changed:
             return
+        netem = ["netem"]
         # jitter and delay use the same delay statement
         if delay is not None:
-            netem += f" delay {delay}us"
+            netem.append(f"delay {delay}us")
         if jitter is not None:
             if delay is None:
-                netem += f" delay 0us {jitter}us 25%"
+                netem.append(f"delay 0us {jitter}us 25%")
             else:
-                netem += f" {jitter}us 25%"
+                netem.append(f"{jitter}us 25%")
 
         if loss is not None and loss > 0:
-            netem += f" loss {min(loss, 100)}%"
+            netem.append(f"loss {min(loss, 100)}%")
         if duplicate is not None and duplicate > 0:
-            netem += f" duplicate {min(duplicate, 100)}%"
+            netem.append(f"duplicate {min(duplicate, 100)}%")
 
         delay_check = delay is None or delay <= 0
         jitter_check = jitter is None or jitter <= 0
@@ -514,19 +661,18 @@ class CoreNetwork(CoreNetworkBase):
         duplicate_check = duplicate is None or duplicate <= 0
         if all([delay_check, jitter_check, loss_check, duplicate_check]):
             # possibly remove netem if it exists and parent queue wasn't removed
-            if not netif.getparam("has_netem"):
-                return
-            if self.up:
-                cmd = f"{TC_BIN} qdisc delete dev {devname} {parent} handle 10:"
-                netif.host_cmd(cmd)
-            netif.setparam("has_netem", False)
+            if has_netem:
+                if self.up:
+                    cmds.append(f"qdisc delete dev {devname} {parent} handle 10:")
+                has_netem = False
         elif len(netem) > 1:
             if self.up:
-                cmd = (
-                    f"{TC_BIN} qdisc replace dev {devname} {parent} handle 10: {netem}"
-                )
-                netif.host_cmd(cmd)
-            netif.setparam("has_netem", True)
+                args = " ".join(netem)
+                cmds.append(f"qdisc replace dev {devname} {parent} handle 10: {args}")
+            has_netem = True
+        tccmds(netif.host_cmd, cmds)
+        netif.setparam("has_tbf", has_tbf)
+        netif.setparam("has_netem", has_netem)
 
     def linknet(self, net: CoreNetworkBase) -> CoreInterface:
         """
@@ -536,12 +682,8 @@ class CoreNetwork(CoreNetworkBase):
         :param net: network to link with
         :return: created interface
         """
-        sessionid = self.session.short_session_id()
-        try:
-            _id = f"{self.id:x}"
-        except TypeError:
-            _id = str(self.id)
-
+        sessionid = self._sessionid
+        _id = self._id_hex
         try:
             net_id = f"{net.id:x}"
         except TypeError:
@@ -561,8 +703,6 @@ class CoreNetwork(CoreNetworkBase):
             netif.net_client.set_interface_master(net.brname, netif.name)
         i = net.newifindex()
         net._netif[i] = netif
-        with net._linked_lock:
-            net._linked[netif] = {}
         netif.net = self
         netif.othernet = net
         return netif
@@ -753,12 +893,32 @@ class CtrlNet(CoreNetwork):
         :return:
         """
         self.prefix: netaddr.IPNetwork = netaddr.IPNetwork(prefix).cidr
+        # cached to build prefix addresses without indexing the network
+        self._prefix_first: int = self.prefix.first
+        self._prefix_size: int = self.prefix.size
+        self._prefix_suffix: str = f"/{self.prefix.prefixlen}"
         self.hostid: Optional[int] = hostid
         self.assign_address: bool = assign_address
         self.updown_script: Optional[str] = updown_script
         self.serverintf: Optional[str] = serverintf
         super().__init__(session, _id, name, start, server)
 
+    def prefix_address(self, index: int) -> str:
+        """
+        Retrieve an address within the control network prefix, including the
+        prefix length.
+
+        :param index: address index within prefix, negative values index from the end
+        :return: address for index
+        :raises IndexError: when index is outside of the prefix
+        """
+        if index < 0:
+            index += self._prefix_size
+        if not 0 <= index < self._prefix_size:
+            raise IndexError(f"index out of range for prefix {self.prefix}")
+        address = netaddr.IPAddress(self._prefix_first + index, self.prefix.version)
+        return f"{address}{self._prefix_suffix}"
+
     def add_addresses(self, index: int) -> None:
         """
         Add addresses used for created control networks,
@@ -767,16 +927,14 @@ class CtrlNet(CoreNetwork):
         :return: nothing
         """
         use_ovs = self.session.options.get_config("ovs") == "True"
-        address = self.prefix[index]
-        current = f"{address}/{self.prefix.prefixlen}"
+        current = self.prefix_address(index)
         net_client = get_net_client(use_ovs, utils.cmd)
         net_client.create_address(self.brname, current)
         servers = self.session.distributed.servers
         for name in servers:
             server = servers[name]
             index -= 1
-            address = self.prefix[index]
-            current = f"{address}/{self.prefix.prefixlen}"
+            current = self.prefix_address(index)
             net_client = get_net_client(use_ovs, server.remote_cmd)
             net_client.create_address(self.brname, current)
 
@@ -899,33 +1057,21 @@ class PtpNet(CoreNetwork):
         if if1.getparams() != if2.getparams():
             unidirectional = 1
 
-        interface1_ip4 = None
-        interface1_ip4_mask = None
-        interface1_ip6 = None
-        interface1_ip6_mask = None
-        for address in if1.addrlist:
-            ip, _sep, mask = address.partition("/")
-            mask = int(mask)
-            if netaddr.valid_ipv4(ip):
-                interface1_ip4 = ip
-                interface1_ip4_mask = mask
-            else:
-                interface1_ip6 = ip
-                interface1_ip6_mask = mask
-
-        interface2_ip4 = None
-        interface2_ip4_mask = None
-        interface2_ip6 = None
-        interface2_ip6_mask = None
-        for address in if2.addrlist:
-            ip, _sep, mask = address.partition("/")
-            mask = int(mask)
-            if netaddr.valid_ipv4(ip):
-                interface2_ip4 = ip
-                interface2_ip4_mask = mask
-            else:
-                interface2_ip6 = ip
-                interface2_ip6_mask = mask
+        (
+            interface1_ip4,
+            interface1_ip4_mask,
+            interface1_ip6,
+            interface1_ip6_mask,
+        ) = if1.parsed_addrlist()
+        (
+            interface2_ip4,
+            interface2_ip4_mask,
+            interface2_ip6,
+            interface2_ip6_mask,
+        ) = if2.parsed_addrlist()
+        if1_index = if1.node.getifindex(if1)
+        if2_index = if2.node.getifindex(if2)
+        if1_delay, if1_bw, if1_loss, if1_dup, if1_jitter = if1.get_link_params()
 
         link_data = LinkData(
             message_type=flags,
@@ -933,19 +1079,19 @@ class PtpNet(CoreNetwork):
             node2_id=if2.node.id,
             link_type=self.linktype,
             unidirectional=unidirectional,
-            delay=if1.getparam("delay"),
-            bandwidth=if1.getparam("bw"),
-            per=if1.getparam("loss"),
-            dup=if1.getparam("duplicate"),
-            jitter=if1.getparam("jitter"),
-            interface1_id=if1.node.getifindex(if1),
+            delay=if1_delay,
+            bandwidth=if1_bw,
+            per=if1_loss,
+            dup=if1_dup,
+            jitter=if1_jitter,
+            interface1_id=if1_index,
             interface1_name=if1.name,
             interface1_mac=if1.hwaddr,
             interface1_ip4=interface1_ip4,
             interface1_ip4_mask=interface1_ip4_mask,
             interface1_ip6=interface1_ip6,
             interface1_ip6_mask=interface1_ip6_mask,
-            interface2_id=if2.node.getifindex(if2),
+            interface2_id=if2_index,
             interface2_name=if2.name,
             interface2_mac=if2.hwaddr,
             interface2_ip4=interface2_ip4,
@@ -959,19 +1105,20 @@ class PtpNet(CoreNetwork):
         # build a 2nd link message for the upstream link parameters
         # (swap if1 and if2)
         if unidirectional:
+            if2_delay, if2_bw, if2_loss, if2_dup, if2_jitter = if2.get_link_params()
             link_data = LinkData(
                 message_type=MessageFlags.NONE,
                 link_type=self.linktype,
                 node1_id=if2.node.id,
                 node2_id=if1.node.id,
-                delay=if2.getparam("delay"),
-                bandwidth=if2.getparam("bw"),
-                per=if2.getparam("loss"),
-                dup=if2.getparam("duplicate"),
-                jitter=if2.getparam("jitter"),
+                delay=if2_delay,
+                bandwidth=if2_bw,
+                per=if2_loss,
+                dup=if2_dup,
+                jitter=if2_jitter,
                 unidirectional=1,
-                interface1_id=if2.node.getifindex(if2),
-                interface2_id=if1.node.getifindex(if1),
+                interface1_id=if2_index,
+                interface2_id=if1_index,
             )
             all_links.append(link_data)
 
@@ -1042,6 +1189,11 @@ class WlanNode(CoreNetwork):
         # wireless and mobility models (BasicRangeModel, Ns2WaypointMobility)
         self.model: Optional[WirelessModel] = None
         self.mobility: Optional[WayPointMobility] = None
+        # link data of models with cache_link_data set, cached per message flags
+        # and tagged with the links version it was built from, links version
+        # changes when wireless links change
+        self._links_version: int = 0
+        self._model_links: Dict[MessageFlags, Tuple[int, List[LinkData]]] = {}
 
     def startup(self) -> None:
         """
@@ -1065,6 +1217,38 @@ class WlanNode(CoreNetwork):
             netif.poshook = self.model.position_callback
             netif.setposition()
 
+    def detach(self, netif: CoreInterface) -> None:
+        """
+        Detach a network interface.
+
+        :param netif: network interface
+        :return: nothing
+        """
+        super().detach(netif)
+        self._links_version += 1
+
+    def link(self, netif1: CoreInterface, netif2: CoreInterface) -> None:
+        """
+        Link two interfaces together.
+
+        :param netif1: interface one
+        :param netif2: interface two
+        :return: nothing
+        """
+        super().link(netif1, netif2)
+        self._links_version += 1
+
+    def unlink(self, netif1: CoreInterface, netif2: CoreInterface) -> None:
+        """
+        Unlink two interfaces.
+
+        :param netif1: interface one
+        :param netif2: interface two
+        :return: nothing
+        """
+        super().unlink(netif1, netif2)
+        self._links_version += 1
+
     def setmodel(self, model: "WirelessModelType", config: Dict[str, str]):
         """
         Sets the mobility and wireless model.
@@ -1076,6 +1260,7 @@ class WlanNode(CoreNetwork):
         logging.debug("node(%s) setting model: %s", self.name, model.name)
         if model.config_type == RegisterTlvs.WIRELESS:
             self.model = model(session=self.session, _id=self.id)
+            self._links_version += 1
             for netif in self.netifs():
                 netif.poshook = self.model.position_callback
                 netif.setposition()
@@ -1096,6 +1281,7 @@ class WlanNode(CoreNetwork):
             "node(%s) updating model(%s): %s", self.id, self.model.name, config
         )
         self.model.update_config(config)
+        self._links_version += 1
         for netif in self.netifs():
             netif.setposition()
 
@@ -1107,7 +1293,14 @@ class WlanNode(CoreNetwork):
         :return: list of link data
         """
         all_links = super().all_link_data(flags)
-        if self.model:
+        if self.model and self.model.cache_link_data:
+            version = self._links_version
+            cached = self._model_links.get(flags)
+            if cached is None or cached[0] != version:
+                cached = (version, self.model.all_link_data(flags))
+                self._model_links[flags] = cached
+            all_links.extend(cached[1])
+        elif self.model:
             all_links.extend(self.model.all_link_data(flags))
         return all_links
 
@@ -0,0 +1,187 @@
+import gc
+import time
+from typing import Tuple
+
+import mock
+import pytest
+
+from core.constants import EBTABLES_BIN
+from core.emulator.emudata import InterfaceData
+from core.emulator.session import Session
+from core.nodes.base import CoreNode
+from core.nodes.interface import CoreInterface
+from core.nodes.network import (
+    CoreNetwork,
+    EbtablesQueue,
+    SwitchNode,
+    WlanNode,
+    ebtablescmds,
+)
+
+
+@pytest.fixture
+def queue() -> EbtablesQueue:
+    queue = EbtablesQueue()
+    with mock.patch("core.nodes.network.ebq", queue):
+        yield queue
+
+
+def create_interfaces(
+    session: Session, net: CoreNetwork
+) -> Tuple[CoreInterface, CoreInterface]:
+    node_one = session.add_node(CoreNode)
+    node_two = session.add_node(CoreNode)
+    index_one = node_one.newnetif(net, InterfaceData())
+    index_two = node_two.newnetif(net, InterfaceData())
+    return node_one.netif(index_one), node_two.netif(index_two)
+
+
+class TestEbtables:
+    def test_queue_collected_wlan(self, session: Session):
+        # given
+        queue = EbtablesQueue()
+        wlan = WlanNode(session, start=False)
+        queue.ebchange(wlan)
+        del wlan
+        gc.collect()
+        wlan = WlanNode(session, start=False)
+        queue.ebchange(wlan)
+
+        # when
+        with mock.patch.object(queue, "ebcommit") as ebcommit:
+            queue.startupdateloop(wlan)
+            for _ in range(20):
+                if ebcommit.called:
+                    break
+                time.sleep(0.1)
+            queue.stopupdateloop(wlan)
+
+        # then
+        ebcommit.assert_called_with(wlan)
+
+    def test_queue_rate(self, session: Session):
+        # given
+        queue = EbtablesQueue()
+        wlan_one = WlanNode(session, start=False)
+        wlan_two = WlanNode(session, start=False)
+
+        # when
+        try:
+            session.options.set_config("ebtables_rate", "0.1")
+            queue.startupdateloop(wlan_one)
+            session.options.set_config("ebtables_rate", "0.5")
+            queue.startupdateloop(wlan_two)
+            fastest_rate = queue.rate
+            queue.stopupdateloop(wlan_one)
+            remaining_rate = queue.rate
+            queue.stopupdateloop(wlan_two)
+        finally:
+            session.options.set_config("ebtables_rate", str(EbtablesQueue.rate))
+
+        # then
+        assert fastest_rate == 0.1
+        assert remaining_rate == 0.5
+        assert queue.rate == EbtablesQueue.rate
+
+    def test_buildcmds_chain(self, session: Session, queue: EbtablesQueue):
+        # given
+        wlan = WlanNode(session, start=False)
+
+        # when
+        queue.buildcmds(wlan)
+
+        # then
+        assert queue.cmds == [
+            f"-N {wlan.brname} -P DROP",
+            f"-A FORWARD --logical-in {wlan.brname} -j {wlan.brname}",
+        ]
+
+    def test_buildcmds_link_unlink(self, session: Session, queue: EbtablesQueue):
+        # given
+        wlan = WlanNode(session, start=False)
+        interface_one, interface_two = create_interfaces(session, wlan)
+        queue.buildcmds(wlan)
+        queue.cmds = []
+        rules = wlan.ebrules(interface_one, interface_two)
+
+        # when
+        wlan.link(interface_one, interface_two)
+        queue.buildcmds(wlan)
+        link_cmds = queue.cmds
+        queue.cmds = []
+        wlan.unlink(interface_one, interface_two)
+        queue.buildcmds(wlan)
+
+        # then
+        assert all("-j ACCEPT" in rule for rule in rules)
+        assert link_cmds == [f"-A {rule}" for rule in rules]
+        assert queue.cmds == [f"-D {rule}" for rule in rules]
+
+    def test_buildcmds_toggle(self, session: Session, queue: EbtablesQueue):
+        # given
+        wlan = WlanNode(session, start=False)
+        interface_one, interface_two = create_interfaces(session, wlan)
+        queue.buildcmds(wlan)
+        queue.cmds = []
+
+        # when
+        wlan.link(interface_one, interface_two)
+        wlan.unlink(interface_one, interface_two)
+        with mock.patch.object(queue, "ebcommit") as ebcommit:
+            queue.ebupdate(wlan)
+
+        # then
+        assert queue.cmds == []
+        ebcommit.assert_not_called()
+
+    def test_buildcmds_detach(self, session: Session, queue: EbtablesQueue):
+        # given
+        wlan = WlanNode(session, start=False)
+        interface_one, interface_two = create_interfaces(session, wlan)
+        wlan.link(interface_one, interface_two)
+        queue.buildcmds(wlan)
+        queue.cmds = []
+        rules = wlan.ebrules(interface_one, interface_two)
+
+        # when
+        wlan.detach(interface_one)
+        queue.buildcmds(wlan)
+
+        # then
+        assert queue.cmds == [f"-D {rule}" for rule in rules]
+
+    def test_buildcmds_accept_policy(self, session: Session, queue: EbtablesQueue):
+        # given
+        switch = SwitchNode(session, start=False)
+        interface_one, interface_two = create_interfaces(session, switch)
+
+        # when
+        queue.buildcmds(switch)
+        chain_cmds = queue.cmds
+        queue.cmds = []
+        switch.unlink(interface_one, interface_two)
+        queue.buildcmds(switch)
+
+        # then
+        rules = switch.ebrules(interface_one, interface_two)
+        assert all("-j DROP" in rule for rule in rules)
+        assert chain_cmds == [
+            f"-N {switch.brname} -P ACCEPT",
+            f"-A FORWARD --logical-in {switch.brname} -j {switch.brname}",
+        ]
+        assert queue.cmds == [f"-A {rule}" for rule in rules]
+
+    def test_ebtablescmds(self):
+        # given
+        call = mock.MagicMock()
+        cmds = ["-D FORWARD --logical-in b.1.1 -j b.1.1", "-X b.1.1"]
+
+        # when
+        ebtablescmds(call, cmds)
+
+        # then
+        call.assert_called_once_with(
+            f"{EBTABLES_BIN} -D FORWARD --logical-in b.1.1 -j b.1.1 && "
+            f"{EBTABLES_BIN} -X b.1.1",
+            shell=True,
+        )
@@ -1,14 +1,19 @@
 from typing import Tuple
 
-from core.emulator.emudata import IpPrefixes, LinkOptions
+import mock
+import pytest
+
+from core.constants import TC_BIN
+from core.emulator.emudata import InterfaceData, IpPrefixes, LinkOptions
 from core.emulator.session import Session
+from core.errors import CoreCommandError
 from core.nodes.base import CoreNode
 from core.nodes.network import SwitchNode
 
 
 def create_ptp_network(
-    session: Session, ip_prefixes: IpPrefixes
-) -> Tuple[CoreNode, CoreNode]:
+    session: Session, ip_prefixes: IpPrefixes, instantiate: bool = True
+) -> Tuple[CoreNode, CoreNode, InterfaceData, InterfaceData]:
     # create nodes
     node_one = session.add_node(CoreNode)
     node_two = session.add_node(CoreNode)
@@ -19,25 +24,25 @@ def create_ptp_network(
     session.add_link(node_one.id, node_two.id, interface_one, interface_two)
 
     # instantiate session
-    session.instantiate()
+    if instantiate:
+        session.instantiate()
 
-    return node_one, node_two
+    return node_one, node_two, interface_one, interface_two
 
 
 class TestLinks:
     def test_ptp(self, session: Session, ip_prefixes: IpPrefixes):
-        # given
-        node_one = session.add_node(CoreNode)
-        node_two = session.add_node(CoreNode)
-        interface_one = ip_prefixes.create_interface(node_one)
-        interface_two = ip_prefixes.create_interface(node_two)
-
         # when
-        session.add_link(node_one.id, node_two.id, interface_one, interface_two)
+        node_one, node_two, interface_one, interface_two = create_ptp_network(
+            session, ip_prefixes, instantiate=False
+        )
 
         # then
         assert node_one.netif(interface_one.id)
         assert node_two.netif(interface_two.id)
+        net = node_one.netif(interface_one.id).net
+        assert net
+        assert net is node_two.netif(interface_two.id).net
 
     def test_node_to_net(self, session: Session, ip_prefixes: IpPrefixes):
         # given
@@ -117,11 +122,9 @@ class TestLinks:
 
     def test_link_delete(self, session: Session, ip_prefixes: IpPrefixes):
         # given
-        node_one = session.add_node(CoreNode)
-        node_two = session.add_node(CoreNode)
-        interface_one = ip_prefixes.create_interface(node_one)
-        interface_two = ip_prefixes.create_interface(node_two)
-        session.add_link(node_one.id, node_two.id, interface_one, interface_two)
+        node_one, node_two, interface_one, interface_two = create_ptp_network(
+            session, ip_prefixes, instantiate=False
+        )
         assert node_one.netif(interface_one.id)
         assert node_two.netif(interface_two.id)
 
@@ -133,3 +136,50 @@ class TestLinks:
         # then
         assert not node_one.netif(interface_one.id)
         assert not node_two.netif(interface_two.id)
+
+    def test_linkconfig_tc_batch(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        node_one = session.add_node(CoreNode)
+        node_two = session.add_node(SwitchNode)
+        interface_one_data = ip_prefixes.create_interface(node_one)
+        session.add_link(node_one.id, node_two.id, interface_one_data)
+        interface_one = node_one.netif(interface_one_data.id)
+        devname = interface_one.localname
+        link_options = LinkOptions()
+        link_options.bandwidth = 5000000
+        link_options.delay = 50
+
+        # when
+        with mock.patch("core.utils.cmd") as cmd:
+            node_two.linkconfig(interface_one, link_options)
+
+        # then
+        script = (
+            f"{TC_BIN} -batch - << 'EOF'\n"
+            f"qdisc replace dev {devname} root handle 1: "
+            f"tbf rate 5000000 burst 5000 limit 65535\n"
+            f"qdisc replace dev {devname} parent 1:1 handle 10: netem delay 50us\n"
+            f"EOF"
+        )
+        cmd.assert_called_once_with(script, None, None, True, True)
+
+    def test_linkconfig_tc_error(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        node_one = session.add_node(CoreNode)
+        node_two = session.add_node(SwitchNode)
+        interface_one_data = ip_prefixes.create_interface(node_one)
+        session.add_link(node_one.id, node_two.id, interface_one_data)
+        interface_one = node_one.netif(interface_one_data.id)
+        link_options = LinkOptions()
+        link_options.bandwidth = 5000000
+        link_options.delay = 50
+
+        # when
+        with mock.patch("core.utils.cmd") as cmd:
+            cmd.side_effect = CoreCommandError(1, "tc")
+            with pytest.raises(CoreCommandError):
+                node_two.linkconfig(interface_one, link_options)
+
+        # then
+        assert not interface_one.getparam("has_tbf")
+        assert not interface_one.getparam("has_netem")
@@ -1,15 +1,26 @@
+from typing import List
+
+import mock
 import pytest
 
+from core.emulator.data import LinkData
 from core.emulator.emudata import InterfaceData, NodeOptions
+from core.emulator.enumerations import LinkTypes
 from core.emulator.session import Session
 from core.errors import CoreError
+from core.location.mobility import BasicRangeModel
 from core.nodes.base import CoreNode
-from core.nodes.network import HubNode, SwitchNode, WlanNode
+from core.nodes.network import CtrlNet, HubNode, SwitchNode, WlanNode
 
 MODELS = ["router", "host", "PC", "mdr"]
 NET_TYPES = [SwitchNode, HubNode, WlanNode]
 
 
+def wireless_links(wlan: WlanNode) -> List[LinkData]:
+    links = wlan.all_link_data()
+    return [x for x in links if x.link_type == LinkTypes.WIRELESS]
+
+
 class TestNodes:
     @pytest.mark.parametrize("model", MODELS)
     def test_node_add(self, session: Session, model: str):
@@ -105,6 +116,22 @@ class TestNodes:
         with pytest.raises(CoreError):
             node.addaddr(index, addr)
 
+    def test_node_parsed_addrlist(self, session: Session):
+        # given
+        node = session.add_node(CoreNode)
+        switch = session.add_node(SwitchNode)
+        interface_data = InterfaceData()
+        index = node.newnetif(switch, interface_data)
+        interface = node.netif(index)
+        node.addaddr(index, "192.168.0.1/24")
+        assert interface.parsed_addrlist() == ("192.168.0.1", 24, None, None)
+
+        # when
+        node.addaddr(index, "2001::1/64")
+
+        # then
+        assert interface.parsed_addrlist() == ("192.168.0.1", 24, "2001::1", 64)
+
     @pytest.mark.parametrize("net_type", NET_TYPES)
     def test_net(self, session, net_type):
         # given
@@ -115,3 +142,72 @@ class TestNodes:
         # then
         assert node
         assert node.up
+
+    def test_ctrlnet_prefix_address(self, session: Session):
+        # given
+        ctrlnet = CtrlNet(session, "172.16.0.0/24", start=False)
+
+        # when
+        first = ctrlnet.prefix_address(1)
+        last = ctrlnet.prefix_address(-2)
+
+        # then
+        assert first == "172.16.0.1/24"
+        assert last == "172.16.0.254/24"
+        with pytest.raises(IndexError):
+            ctrlnet.prefix_address(256)
+
+    def test_wlan_model_link_cache(self, session: Session):
+        # given
+        wlan = session.add_node(WlanNode)
+        wlan.setmodel(BasicRangeModel, BasicRangeModel.default_values())
+        node_one = session.add_node(CoreNode)
+        node_two = session.add_node(CoreNode)
+        interface_one = node_one.netif(node_one.newnetif(wlan, InterfaceData()))
+        interface_two = node_two.netif(node_two.newnetif(wlan, InterfaceData()))
+        model = wlan.model
+
+        # when
+        with mock.patch.object(
+            model, "all_link_data", wraps=model.all_link_data
+        ) as model_links:
+            first = wireless_links(wlan)
+            second = wireless_links(wlan)
+            cached_builds = model_links.call_count
+            wlan.unlink(interface_one, interface_two)
+            unlinked = wireless_links(wlan)
+            wlan.link(interface_one, interface_two)
+            linked = wireless_links(wlan)
+            builds = model_links.call_count
+            wlan.updatemodel(BasicRangeModel.default_values())
+            wireless_links(wlan)
+            updated_builds = model_links.call_count
+            wlan.detach(interface_two)
+            detached = wireless_links(wlan)
+
+        # then
+        assert len(first) == 1
+        assert second == first
+        assert cached_builds == 1
+        assert unlinked == []
+        assert linked == first
+        assert builds == 3
+        assert updated_builds == 4
+        assert detached == []
+
+    def test_wlan_model_link_no_cache(self, session: Session):
+        # given
+        wlan = session.add_node(WlanNode)
+        wlan.setmodel(BasicRangeModel, BasicRangeModel.default_values())
+        model = wlan.model
+        model.cache_link_data = False
+
+        # when
+        with mock.patch.object(
+            model, "all_link_data", wraps=model.all_link_data
+        ) as model_links:
+            wireless_links(wlan)
+            wireless_links(wlan)
+
+        # then
+        assert model_links.call_count == 2